@@ -1,11 +1,17 @@
 import logging
+from typing import Dict
 
-# Configure the logger
-logging.basicConfig(level=logging.DEBUG,
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+PANEL_EFFICIENCY = 0.18  # Standard module efficiency (18%)
+DAYS_PER_YEAR = 365
+INSTALLATION_COST_PER_KW = 2500  # USD per kW of system capacity
+
+# Reciprocal of (days/year * panel efficiency), so the panel area is a single multiply
+_INV_ANNUAL_RAD_EFF = 1.0 / (DAYS_PER_YEAR * PANEL_EFFICIENCY)
+
 def calculate_panel_area(dc_annual: float, solrad_annual: float, panel_efficiency: float) -> float:
     """
     Calculates the required panel area based on DC annual output, solar radiation, and panel efficiency.
@@ -15,21 +21,45 @@ def calculate_panel_area(dc_annual: float, solrad_annual: float, panel_efficienc
     :param panel_efficiency: Panel efficiency (e.g., 0.18 for 18%)
     :return: Required panel area in m²
     """
-    # Convert solrad from kWh/m²/day to kWh/m²/year
-    annual_solar_radiation = solrad_annual * 365  # kWh/m²/year
-    logger.debug(f"Annual Solar Radiation: {annual_solar_radiation} kWh/m²/year")
-    
-    if annual_solar_radiation <= 0:
+    if solrad_annual <= 0:
         raise ValueError("Annual solar radiation must be greater than 0.")
+
+    # Convert solrad from kWh/m²/day to kWh/m²/year
+    annual_solar_radiation = solrad_annual * DAYS_PER_YEAR  # kWh/m²/year
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Annual Solar Radiation: %s kWh/m²/year", annual_solar_radiation)
     
     # Handle dc_annual if it's a list
     dc_annual_value = dc_annual[0] if isinstance(dc_annual, (list, tuple)) else dc_annual
     
     panel_area = float(dc_annual_value) / (annual_solar_radiation * panel_efficiency)
-    logger.debug(f"Calculated Panel Area: {panel_area} m²")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Calculated Panel Area: %s m²", panel_area)
     
     return panel_area
 
+def calculate_panel_area_from_ac(ac_annual: float, solrad_annual: float, system_efficiency: float) -> float:
+    """
+    Calculates the required panel area straight from AC annual output, folding the
+    AC-to-DC conversion and the standard panel efficiency into one expression.
+
+    :param ac_annual: Annual AC output (kWhac)
+    :param solrad_annual: Average daily solar radiation (kWh/m²/day)
+    :param system_efficiency: Fraction of DC output left after system losses (e.g., 0.86)
+    :return: Required panel area in m²
+    """
+    if solrad_annual <= 0:
+        raise ValueError("Annual solar radiation must be greater than 0.")
+
+    # Handle ac_annual if it's a list
+    ac_annual_value = ac_annual[0] if isinstance(ac_annual, (list, tuple)) else ac_annual
+
+    panel_area = float(ac_annual_value) / (system_efficiency * solrad_annual) * _INV_ANNUAL_RAD_EFF
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Calculated Panel Area: %s m²", panel_area)
+
+    return panel_area
+
 def calculate_cost_savings(ac_annual: float, energy_price: float) -> float:
     """
     Calculates the annual cost savings based on AC annual output and energy price.
@@ -64,4 +94,48 @@ def calculate_co2_reduction(ac_annual: float, emission_factor: float) -> float:
     """
     # Handle ac_annual if it's a list
     ac_annual_value = ac_annual[0] if isinstance(ac_annual, (list, tuple)) else ac_annual
-    return float(ac_annual_value) * float(emission_factor)  # in kg
\ No newline at end of file
+    return float(ac_annual_value) * float(emission_factor)  # in kg
+
+def calculate_solar_metrics_batch(ac_annual, solrad_annual, losses, energy_price,
+                                  carbon_intensity, system_capacity) -> Dict[str, np.ndarray]:
+    """
+    Calculates panel area, cost savings, ROI and CO2 reduction for many locations at once.
+    Each argument is a sequence (or array) with one entry per location.
+
+    :param ac_annual: Annual AC output (kWhac)
+    :param solrad_annual: Average daily solar radiation (kWh/m²/day)
+    :param losses: System losses in percentage
+    :param energy_price: Energy price in USD/kWh
+    :param carbon_intensity: Carbon intensity in gCO2eq/kWh
+    :param system_capacity: System capacity in kW
+    :return: Dictionary of float64 arrays keyed by metric name
+    """
+    ac_annual = np.asarray(ac_annual, dtype=np.float64)
+    solrad_annual = np.asarray(solrad_annual, dtype=np.float64)
+    losses = np.asarray(losses, dtype=np.float64)
+    energy_price = np.asarray(energy_price, dtype=np.float64)
+    carbon_intensity = np.asarray(carbon_intensity, dtype=np.float64)
+    system_capacity = np.asarray(system_capacity, dtype=np.float64)
+
+    if np.any(solrad_annual <= 0):
+        raise ValueError("Annual solar radiation must be greater than 0.")
+    if not np.all((losses >= 0) & (losses < 100)):
+        raise ValueError("System losses must be at least 0% and below 100%.")
+    if np.any(system_capacity < 0):
+        raise ValueError("System capacity must not be negative.")
+
+    system_efficiency = 1 - losses / 100
+    panel_area = ac_annual / (system_efficiency * solrad_annual) * _INV_ANNUAL_RAD_EFF
+    annual_cost_savings = ac_annual * energy_price
+    if np.any(annual_cost_savings <= 0):
+        raise ValueError("Annual savings must be greater than 0.")
+    # Savings were checked to be positive above, so the division needs no clamp
+    roi_years = system_capacity * INSTALLATION_COST_PER_KW / annual_cost_savings
+    co2_reduction = ac_annual * (carbon_intensity / 1000)  # kg CO2
+
+    return {
+        "panel_area": panel_area,
+        "annual_cost_savings": annual_cost_savings,
+        "roi_years": roi_years,
+        "co2_reduction": co2_reduction
+    }
@@ -1,39 +1,80 @@
+import asyncio
+import json
 import math
-import os
-import aiohttp
-import requests
+import re
+from functools import lru_cache
+from contextlib import asynccontextmanager
 import logging
 import pandas as pd
-from fastapi import FastAPI, HTTPException
+from typing import Optional, Tuple
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from langchain_community.chat_models import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import ConversationChain
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain.memory import ConversationSummaryBufferMemory
 
-from app.models.solar_assessment import Location, LocationRequest, PVWattsRequest, SolarAssessmentRequest, SolarAssessmentResponse
+from app.models.solar_assessment import Location, LocationRequest, PVWattsRequest, SolarAssessmentRequest, SolarAssessmentResponse, SolarBatchRequest, SolarBatchResponse
 from app.models.wind import WindDataRequest, WindDataResponse
 from app.services.electricity_map import get_carbon_intensity
 from app.services.nrel_pvwatts import get_pvwatts_data
 from app.services.nrel_utility_rates import get_utility_rates
-from app.calculations.solar_calculations import calculate_panel_area, calculate_cost_savings, calculate_roi, calculate_co2_reduction
+from app.calculations.solar_calculations import INSTALLATION_COST_PER_KW, calculate_panel_area_from_ac, calculate_cost_savings, calculate_roi, calculate_co2_reduction, calculate_solar_metrics_batch
 from app.services.wind.fetch.fetch_era5_data import fetch_data as fetch_era5_data
 from app.services.wind.calculate.calculate_air_density import calculate_air_density_from_nc
 from app.services.wind.fetch.fetch_wind_data import fetch_wind_data
 from app.calculations.wind_calculations import calculate_annual_wind_energy, calculate_wind_cost_savings
-from app.services.wind.calculate.merge_and_calculate_power import calculate_wind_metrics, merge_and_calculate_power
+from app.services.wind.calculate.merge_and_calculate_power import calculate_wind_metrics, merge_and_calculate_power, total_energy_kwh
+from app.services.wind.errors import WindDataUnavailable
+from app.services.wind.last_location import load_cached_energy, load_last_location, save_last_location
+from app.utils.cache import TTLCache
+from app.utils.config import settings
+from app.utils.http import close_http_session, get_http_session, open_http_session
+from app.utils.text import normalise_key
 from app.models.ai import ChatRequest, ChatResponse, CombinedAssessmentRequest, CombinedAssessmentResponse
 
 # Set up logging
 logger = logging.getLogger("wind_data_api")
 logger.setLevel(logging.INFO)
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+# Guard against a second handler when the module is imported twice (e.g. by the reloader)
+if not logger.handlers:
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    console_handler.setFormatter(formatter)
+    logger.addHandler(console_handler)
 
-app = FastAPI(title="Renewable Energy Assessment API")
+# Geocoding API setup
+GEOCODING_API_KEY = settings.geocode_api_key
+GEOCODING_API_URL = "https://api.opencagedata.com/geocode/v1/json"
+
+# City coordinates don't move; keep resolved cities (with their OpenCage result type) for a month
+_geocoding_cache = TTLCache(maxsize=1024, ttl=30 * 86400)
+
+# OpenCage result types that name a place an assessment can run for
+_PLACE_TYPES = frozenset({
+    "city", "town", "village", "hamlet", "municipality", "city_district", "suburb", "neighbourhood",
+    "county", "state_district", "state", "province", "region", "island", "country"
+})
+
+OPENAI_API_KEY = settings.openai_api_key
+
+# Combined assessments currently running, keyed by ~1 km grid cell
+_inflight_assessments = {}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled keep-alive session for every outbound call made from the event loop
+    await open_http_session()
+    # Read the last wind run now so no request pays for the read; a cache hit then costs
+    # one stat of the record, which keeps workers coherent with each other's writes
+    load_last_location()
+    try:
+        yield
+    finally:
+        await close_http_session()
+
+app = FastAPI(title="Renewable Energy Assessment API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS setup
 origins = ["http://localhost:5173", 
@@ -46,68 +87,132 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Geocoding API setup
-GEOCODING_API_KEY = os.getenv("GEOCODE_API_KEY")
-GEOCODING_API_URL = "https://api.opencagedata.com/geocode/v1/json"
+# Common assessment requests ("calculate energy in Boston") are recognised without an LLM round-trip.
+# The place must directly follow the phrase, not start with a determiner, pronoun or time word, and be
+# up to five words of letters (short abbreviations like "St." allowed) ending at a clause boundary
+# (; ? ! "then" "please" or the end). A match is only a candidate: chat_with_openai still requires it to
+# geocode to a place (_PLACE_TYPES). Everything else, including lists like "Boston and Chicago" or
+# "Boston, Chicago", goes to the LLM classifier.
+_ASSESS_RE = re.compile(
+    r"\b(?:calculate|estimate|assess|compute)\s+(?:the\s+)?(?:energy|solar|wind|renewable)\s+(?:potential\s+)?"
+    r"(?:in|for|at)\s+"
+    r"(?!(?:my|our|your|his|her|their|its|a|an|the|this|that|these|those|some|any|next|last|home|here|there|"
+    r"today|tonight|tomorrow|now|general|me|us|it)\b)"
+    r"(?P<city>(?:[^\W\d_]{1,3}\.|[^\W\d_]+(?:['-][^\W\d_]+)*)"
+    r"(?:\s+(?!(?:then|and|or|please)\b)(?:[^\W\d_]{1,3}\.|[^\W\d_]+(?:['-][^\W\d_]+)*)){0,4})"
+    r"(?=\.?\s*(?:[;?!]|$)|,?\s+(?:then|please)\b)",
+    re.IGNORECASE
+)
+
+# Messages without any of these words can't be assessment requests, so they skip classification
+_ENERGY_KEYWORDS_RE = re.compile(r"\b(solar|wind|renewable|assessment|assess|potential|energy)\b", re.IGNORECASE)
+
+# Exact-match caches for the two LLM calls in /chat. A repeated question reuses the earlier
+# extraction, and sites whose figures agree to two significant digits share one analysis.
+_location_cache = TTLCache(maxsize=10_000, ttl=86400)
+_analysis_cache = TTLCache(maxsize=10_000, ttl=86400)
+
+def _round_sig(value: float, digits: int = 2) -> float:
+    if value == 0 or not math.isfinite(value):
+        return value
+    return round(value, digits - 1 - int(math.floor(math.log10(abs(value)))))
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+def _assessment_key(assessment) -> tuple:
+    return tuple(_round_sig(v) if isinstance(v, float) else v for v in assessment.dict().values())
 
 # System prompt for general assistant behavior
 system_prompt = """You are an AI assistant specialized in renewable energy assessments and general energy-related discussions."""
 
-# Prompt to determine if the user wants an assessment
-assessment_prompt_template = PromptTemplate(
-    input_variables=["user_message"],
-    template="""
-    Given the user's message: "{user_message}"
+# Prompts keep their static instructions in the system message and the per-request data in
+# later messages, so the shared prefix stays identical between calls and can hit OpenAI's prompt cache.
+# The system messages are built once here; requests only add the history and a HumanMessage.
 
-    Determine if they are requesting an energy assessment and extract the location.
+# Determines if the user wants an assessment; general messages are answered in the same call
+assessment_system_message = SystemMessage(content=system_prompt + """
 
-    If they are requesting an energy assessment for a specific location, respond with just the location name.
-    If they are not requesting an energy assessment, respond with "NO_ASSESSMENT".
-    """
-    )
+    For each user message, determine if they are requesting an energy assessment and extract the location.
 
-energy_assessment_prompt_template = PromptTemplate(
-    input_variables=[
-        "city_name",
-        "solar_data",
-        "wind_data"
-    ],
-    template="""
-    Please analyze these energy assessment results for {city_name}:
+    Respond with a JSON object with these keys:
+    - "is_assessment": true if they are requesting an energy assessment for a specific location, otherwise false
+    - "location": the location name if is_assessment is true, otherwise null
+    - "reply": your reply to the user's message if is_assessment is false, otherwise null
+    """)
 
-    Solar Assessment:
-    {solar_data}
+# Plain conversation for messages the keyword filter rules out
+general_system_message = SystemMessage(content=system_prompt)
 
-    Wind Assessment:
-    {wind_data}
+energy_assessment_system_message = SystemMessage(content="""
+    You will be given energy assessment results for a location.
 
     Provide a detailed analysis including:
     1. Overall renewable energy potential for the location
     2. Comparative advantages between solar and wind
     3. Economic viability and environmental impact
     4. Specific recommendations based on the data
-    """
+    """)
+
+render_energy_assessment = """Location: {}
+
+Solar Assessment:
+{}
+
+Wind Assessment:
+{}""".format
+
+# The LLM client and chat memory are created on first use, so importing the app
+# (tests, tooling, workers that never serve /chat) doesn't pay for LangChain setup
+@lru_cache(maxsize=1)
+def get_llm() -> ChatOpenAI:
+    return ChatOpenAI(
+        openai_api_key=OPENAI_API_KEY,
+        temperature=0.7,
+        model="gpt-4o"
     )
 
-llm = ChatOpenAI(
-    openai_api_key=OPENAI_API_KEY,
-    temperature=0.7,
-    model="gpt-4o"
-)
+@lru_cache(maxsize=1)
+def get_assessment_check_llm():
+    return get_llm().bind(response_format={"type": "json_object"})
 
-memory = ConversationBufferMemory(return_messages=True)
+@lru_cache(maxsize=1)
+def get_memory() -> ConversationSummaryBufferMemory:
+    # Recent turns are kept verbatim up to ~2k tokens; older ones are folded into a running summary,
+    # so the history sent with each message stays bounded however long the session runs
+    return ConversationSummaryBufferMemory(llm=get_llm(), max_token_limit=2000, return_messages=True)
 
-conversation = ConversationChain(
-    llm=llm,
-    memory=memory,
-    verbose=True  # True to see the prompt construction
-)
 
-assessment_check_chain = assessment_prompt_template | llm
+# Asked when the classifier recognises an assessment request but no location in it
+LOCATION_CLARIFICATION = "Which city or location would you like me to run the energy assessment for?"
+
+async def _general_reply(user_message: str) -> str:
+    """
+    Answer a message as general conversation, without the classification instructions.
+    """
+    history = (await get_memory().aload_memory_variables({}))["history"]
+    response = await get_llm().ainvoke([general_system_message, *history, HumanMessage(content=user_message)])
+    return response.content.strip()
+
+async def _classify_message(user_message: str):
+    """
+    Ask the LLM whether a message requests an assessment, answering it directly when it doesn't.
+    Returns (location or "NO_ASSESSMENT", reply or None).
+    """
+    history = (await get_memory().aload_memory_variables({}))["history"]
+    response = await get_assessment_check_llm().ainvoke([assessment_system_message, *history, HumanMessage(content=user_message)])
+    content = response.content.strip()
+    try:
+        result = json.loads(content)
+    except json.JSONDecodeError:
+        logger.warning("Assessment classifier returned non-JSON output")
+        return "NO_ASSESSMENT", content or await _general_reply(user_message)
 
-energy_assessment_chain = energy_assessment_prompt_template | llm
+    location = (result.get("location") or "").strip()
+    reply = (result.get("reply") or "").strip()
+    if result.get("is_assessment"):
+        if location:
+            return location, None
+        # An assessment with nothing to assess: ask for the place rather than answer with nothing
+        return "NO_ASSESSMENT", reply or LOCATION_CLARIFICATION
+    return "NO_ASSESSMENT", reply or await _general_reply(user_message)
 
 
 @app.post("/chat", response_model=ChatResponse)
@@ -116,8 +221,22 @@ async def chat_with_openai(request: ChatRequest):
     
     try:
         # Step 1: Check if the user wants an assessment and extract location
-        assessment_response = assessment_check_chain.invoke({"user_message": user_message})
-        location = assessment_response.content.strip()
+        reply = None
+        match = _ASSESS_RE.search(user_message)
+        fast_location = await _match_place(match.group("city").strip()) if match else None
+        if fast_location is not None:
+            location = fast_location
+        elif not _ENERGY_KEYWORDS_RE.search(user_message):
+            # Nothing energy-related: reply directly without the classification instructions
+            location, reply = "NO_ASSESSMENT", await _general_reply(user_message)
+        else:
+            message_key = normalise_key(user_message)
+            location = _location_cache.get(message_key)
+            if location is None:
+                location, reply = await _classify_message(user_message)
+                # Replies depend on the conversation so far; only the extracted location is reusable
+                if location != "NO_ASSESSMENT":
+                    _location_cache.set(message_key, location)
 
         if location != "NO_ASSESSMENT":
             # Step 2: Perform the combined assessment
@@ -129,16 +248,21 @@ async def chat_with_openai(request: ChatRequest):
             solar_data = "\n".join([f"{key}: {value}" for key, value in combined_result.solar_assessment.dict().items()])
             wind_data = "\n".join([f"{key}: {value}" for key, value in combined_result.wind_assessment.dict().items()])
             
-            # Step 3: Generate the analysis using the energy assessment chain
-            analysis_response = energy_assessment_chain.invoke({
-                "city_name": location,
-                "solar_data": solar_data,
-                "wind_data": wind_data
-            })
-
-            analysis = analysis_response.content.strip()
-            memory.chat_memory.add_user_message(user_message)
-            memory.chat_memory.add_ai_message(analysis)
+            # Step 3: Generate the analysis from the assessment results
+            analysis_key = (
+                normalise_key(location),
+                _assessment_key(combined_result.solar_assessment),
+                _assessment_key(combined_result.wind_assessment)
+            )
+            analysis = _analysis_cache.get(analysis_key)
+            if analysis is None:
+                analysis_response = await get_llm().ainvoke([
+                    energy_assessment_system_message,
+                    HumanMessage(content=render_energy_assessment(location, solar_data, wind_data))
+                ])
+                analysis = analysis_response.content.strip()
+                _analysis_cache.set(analysis_key, analysis)
+            await get_memory().asave_context({"input": user_message}, {"output": analysis})
 
             return ChatResponse(
                 response=analysis,
@@ -146,51 +270,83 @@ async def chat_with_openai(request: ChatRequest):
                 wind_assessment=combined_result.wind_assessment
             )
         else:
-            # General conversation, use the system prompt
-            # general_chain =  prompt=PromptTemplate(
-            #         input_variables=["user_message"],
-            #         template=system_prompt + "\n\nUser: {user_message}"
-            #     ) | llm
-            # response = general_chain.invoke({"user_message": user_message})
-            # assistant_response = response.content.strip()
-            assistant_response = conversation.predict(input=user_message)
-            return ChatResponse(response=assistant_response)
+            # General conversation: already answered above
+            await get_memory().asave_context({"input": user_message}, {"output": reply})
+            return ChatResponse(response=reply)
+    except HTTPException:
+        # e.g. the 404 from resolve_coordinates for a location that can't be geocoded
+        raise
     except Exception as e:
-        logger.error(f"Error in /chat endpoint: {e}")
+        logger.error("Error in /chat endpoint: %s", e)
         raise HTTPException(status_code=500, detail="Error processing your request")
 
 
-@app.post("/get_coordinates", response_model=Location)
-async def get_coordinates(location: LocationRequest):
+async def _geocode(city_name: str) -> Optional[Tuple[Location, str]]:
+    """
+    Geocode a name through OpenCage, caching successful lookups.
+    Returns (location, OpenCage result type such as "city"), or None when nothing matched.
+    """
+    cache_key = normalise_key(city_name)
+    cached = _geocoding_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    async with get_http_session().get(GEOCODING_API_URL, params={
+        "q": city_name,
+        "key": GEOCODING_API_KEY,
+        "limit": 1
+    }) as response:
+        data = await response.json()
+
+    if not data["results"]:
+        return None
+    first = data["results"][0]
+    coordinates = first["geometry"]
+    result = (Location(latitude=coordinates["lat"], longitude=coordinates["lng"]),
+              first.get("components", {}).get("_type", ""))
+    _geocoding_cache.set(cache_key, result)
+    return result
+
+async def _match_place(candidate: str) -> Optional[str]:
+    """
+    Confirm that text captured by _ASSESS_RE names a place; None sends the message to the classifier.
+    """
     try:
-        response = requests.get(GEOCODING_API_URL, params={
-            "q": location.city_name,
-            "key": GEOCODING_API_KEY,
-            "limit": 1
-        })
-        data = response.json()
-        
-        if data["results"]:
-            coordinates = data["results"][0]["geometry"]
-            return Location(latitude=coordinates["lat"], longitude=coordinates["lng"])
+        geocoded = await _geocode(candidate)
+    except Exception as e:
+        logger.warning("Geocoding failed for fast-path candidate %r: %s", candidate, e)
+        return None
+    if geocoded is None or geocoded[1] not in _PLACE_TYPES:
+        return None
+    return candidate
+
+async def resolve_coordinates(city_name: str) -> Location:
+    """
+    Geocode a city name through OpenCage, caching successful lookups.
+    """
+    try:
+        geocoded = await _geocode(city_name)
+        if geocoded is not None:
+            return geocoded[0]
         else:
             raise HTTPException(status_code=404, detail="Location not found")
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error fetching coordinates: {e}")
+        logger.error("Error fetching coordinates: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.post("/get_coordinates", response_model=Location)
+async def get_coordinates(location: LocationRequest):
+    return await resolve_coordinates(location.city_name)
+
 @app.post("/calculate_solar_potential", response_model=SolarAssessmentResponse)
-def calculate_solar_potential(request: SolarAssessmentRequest):
+async def calculate_solar_potential(request: SolarAssessmentRequest):
     try:
         # If a city name is provided, fetch coordinates
         if request.city_name:
-            response = requests.post("http://127.0.0.1:8000/get_coordinates", json={"city_name": request.city_name})
-            response_data = response.json()
-            
-            if response.status_code != 200 or "latitude" not in response_data or "longitude" not in response_data:
-                raise HTTPException(status_code=404, detail="City not found or coordinates unavailable.")
-            
-            lat, lon = response_data["latitude"], response_data["longitude"]
+            coordinates = await resolve_coordinates(request.city_name)
+            lat, lon = coordinates.latitude, coordinates.longitude
         else:
             lat, lon = request.latitude, request.longitude
 
@@ -203,8 +359,12 @@ def calculate_solar_potential(request: SolarAssessmentRequest):
             location=Location(latitude=lat, longitude=lon)
         )
         
-        # Get the data from PVWatts
-        pv_outputs = get_pvwatts_data(pvwatts_request)
+        # PVWatts, carbon intensity and utility rates are independent lookups, so fetch them concurrently
+        pv_outputs, carbon_intensity, utility_rates = await asyncio.gather(
+            get_pvwatts_data(pvwatts_request),
+            get_carbon_intensity(lat, lon),  # Will now use default value if API fails
+            get_utility_rates(lat, lon),
+        )
         ac_annual = pv_outputs.get("ac_annual")
         solrad_annual = pv_outputs.get("solrad_annual")
         capacity_factor_percentage = pv_outputs.get("capacity_factor")
@@ -215,20 +375,16 @@ def calculate_solar_potential(request: SolarAssessmentRequest):
         # Convert everything to float and handle list/tuple cases
         capacity_factor = float(capacity_factor_percentage) / 100
         solrad_annual = float(solrad_annual)
-        carbon_intensity = get_carbon_intensity(lat, lon)  # Will now use default value if API fails
-        utility_rates = get_utility_rates(lat, lon)
         energy_price = float(utility_rates.get("residential", 0.1))
 
         system_efficiency = 1 - (pvwatts_request.losses / 100)
-        panel_efficiency = 0.18
         
-        # If ac_annual is a list, use the first value for dc_annual calculation
+        # If ac_annual is a list, use the first value
         ac_annual_value = ac_annual[0] if isinstance(ac_annual, (list, tuple)) else ac_annual
-        dc_annual = float(ac_annual_value) / system_efficiency
         
-        panel_area = calculate_panel_area(dc_annual, solrad_annual, panel_efficiency)
+        panel_area = calculate_panel_area_from_ac(ac_annual_value, solrad_annual, system_efficiency)
         annual_cost_savings = calculate_cost_savings(ac_annual, energy_price)
-        initial_cost = pvwatts_request.system_capacity * 2500
+        initial_cost = pvwatts_request.system_capacity * INSTALLATION_COST_PER_KW
         roi_years = calculate_roi(initial_cost, annual_cost_savings)
         emission_factor = carbon_intensity / 1000  # Convert to kg CO2/kWh
         co2_reduction = calculate_co2_reduction(ac_annual, emission_factor)
@@ -245,101 +401,177 @@ def calculate_solar_potential(request: SolarAssessmentRequest):
         )
 
     except HTTPException as he:
-        logger.error(f"HTTPException occurred: {he.detail}")
+        logger.error("HTTPException occurred: %s", he.detail)
         raise he
     except Exception as e:
-        logger.error(f"Error in solar calculations: {str(e)}")
+        logger.error("Error in solar calculations: %s", e)
         raise HTTPException(status_code=500, detail=f"Error in solar calculations: {str(e)}")
     
-@app.post("/process_wind_data", response_model=WindDataResponse)
-def process_wind_data(request: WindDataRequest):
+@app.post("/calculate_solar_potential_batch", response_model=SolarBatchResponse)
+def calculate_solar_potential_batch(request: SolarBatchRequest):
+    columns = [request.ac_annual, request.solrad_annual, request.losses,
+               request.energy_price, request.carbon_intensity, request.system_capacity]
+    if len({len(column) for column in columns}) != 1:
+        raise HTTPException(status_code=400, detail="All batch fields must have the same length.")
+
     try:
-        # Handle coordinates
-        if request.city_name:
-            response = requests.post("http://127.0.0.1:8000/get_coordinates", json={"city_name": request.city_name})
-            if response.status_code != 200:
-                raise HTTPException(status_code=404, detail="City not found.")
-            response_data = response.json()
-            lat, lon = response_data.get("latitude"), response_data.get("longitude")
-        else:
-            lat, lon = request.lat, request.lon
+        metrics = calculate_solar_metrics_batch(*columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return SolarBatchResponse(**{name: values.tolist() for name, values in metrics.items()})
+
+async def _wind_coordinates(request: WindDataRequest):
+    if request.city_name:
+        coordinates = await resolve_coordinates(request.city_name)
+        lat, lon = coordinates.latitude, coordinates.longitude
+    else:
+        lat, lon = request.lat, request.lon
+
+    if lat is None or lon is None or (lat == 0.0 and lon == 0.0):
+        raise HTTPException(status_code=400, detail="Invalid coordinates provided.")
+    return lat, lon
+
+async def _wind_response(monthly_energy: float, lat: float, lon: float) -> WindDataResponse:
+    # Get utility rate
+    utility_rates = await get_utility_rates(lat, lon)
+    energy_price = float(utility_rates.get("residential", 0.12))
+
+    # Calculate all metrics
+    metrics = calculate_wind_metrics(monthly_energy, energy_price)
+
+    # Return response matching the WindDataResponse model
+    return WindDataResponse(
+        total_energy_kwh=metrics["total_energy_kwh"],
+        capacity_factor_percentage=metrics["capacity_factor_percentage"],
+        cost_savings=metrics["annual_savings"],  # This matches the 'cost_savings' field in the model
+        payback_period=metrics.get("payback_period"),  # Optional
+        co2_reduction=metrics.get("co2_reduction")     # Optional
+    )
+
+async def cached_wind_result(request: WindDataRequest) -> Optional[WindDataResponse]:
+    """
+    Dependency returning the wind assessment from the last pipeline run's record when the
+    request matches it, or None when the pipeline has to run.
+    """
+    try:
+        lat, lon = await _wind_coordinates(request)
+        monthly_energy = load_cached_energy(lat, lon, request.height, request.date_from, request.date_to)
+        if monthly_energy is None:
+            return None
+
+        # Same site as the last run: reuse the stored energy total
+        logger.info("Reusing cached wind data for lat=%s, lon=%s", lat, lon)
+        return await _wind_response(monthly_energy, lat, lon)
+
+    except HTTPException as he:
+        logger.error("HTTPException occurred: %s", he.detail)
+        raise he
+    except Exception as e:
+        logger.error("Error in wind calculations: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        if lat is None or lon is None or (lat == 0.0 and lon == 0.0):
-            raise HTTPException(status_code=400, detail="Invalid coordinates provided.")
+@app.post("/process_wind_data", response_model=WindDataResponse)
+async def process_wind_data(request: WindDataRequest,
+                            cached: Optional[WindDataResponse] = Depends(cached_wind_result)):
+    if cached is not None:
+        return cached
 
-        year, month, day = request.date_from.split('-')
+    try:
+        lat, lon = await _wind_coordinates(request)
+        year, month, day = str(request.date_from.year), f"{request.date_from.month:02d}", f"{request.date_from.day:02d}"
 
         try:
-            # Fetch required data
-            fetch_era5_data(lat, lon, buffer_deg=0.25, year=year, month=month, day=day)
-            calculate_air_density_from_nc()
-            fetch_wind_data(lat, lon, request.height, request.date_from, request.date_to)
-            
-            # Calculate power output
-            df_power = merge_and_calculate_power(
-                wind_data_file='data/wind_data.csv',
-                air_density_file='data/air_density_january_2019.csv',
-                output_file='data/merged_power_data.csv'
-            )
-            
-            # Get utility rate
-            energy_price = float(get_utility_rates(lat, lon).get("residential", 0.12))
-            
-            # Calculate all metrics
-            metrics = calculate_wind_metrics(df_power, energy_price)
-            
-            # Return response matching the WindDataResponse model
-            return WindDataResponse(
-                total_energy_kwh=metrics["total_energy_kwh"],
-                capacity_factor_percentage=metrics["capacity_factor_percentage"],
-                cost_savings=metrics["annual_savings"],  # This matches the 'cost_savings' field in the model
-                payback_period=metrics.get("payback_period"),  # Optional
-                co2_reduction=metrics.get("co2_reduction")     # Optional
+            # The ERA5 and Wind Atlas downloads are independent, so overlap them
+            era5_task = asyncio.create_task(asyncio.to_thread(
+                fetch_era5_data, lat, lon, buffer_deg=0.25, year=year, month=month, day=day
+            ))
+            wind_task = asyncio.create_task(asyncio.to_thread(
+                fetch_wind_data, lat, lon, request.height, request.date_from, request.date_to, output_file=None
+            ))
+            try:
+                # Air density only needs the ERA5 NetCDF
+                era5_file = await era5_task
+                df_air_density = await asyncio.to_thread(calculate_air_density_from_nc, era5_file, output_csv=None)
+                df_wind = await wind_task
+            finally:
+                if not wind_task.done():
+                    wind_task.cancel()
+                elif not wind_task.cancelled():
+                    # Consume a failure nobody awaited (ERA5 failed first) so it isn't logged as never retrieved
+                    wind_task.exception()
+
+            # Calculate power output from the in-memory frames; only the last-location record
+            # (save_last_location below) is persisted
+            df_power = await asyncio.to_thread(
+                merge_and_calculate_power,
+                output_file=None,
+                df_wind=df_wind,
+                df_air_density=df_air_density
             )
+            monthly_energy = total_energy_kwh(df_power)
+            # The site and its result go into one record, so workers can't pair one run's
+            # location with another run's energy
+            save_last_location(lat, lon, request.height, request.date_from, request.date_to, monthly_energy)
+
+            return await _wind_response(monthly_energy, lat, lon)
 
-        except requests.HTTPError as http_err:
-            if "500 Server Error" in str(http_err):
-                raise HTTPException(
-                    status_code=404,
-                    detail="We currently don't have coverage in this location."
-                )
-            else:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Wind data API is currently unavailable. Please try again later."
-                )
+        except WindDataUnavailable as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
 
     except HTTPException as he:
-        logger.error(f"HTTPException occurred: {he.detail}")
+        logger.error("HTTPException occurred: %s", he.detail)
         raise he
     except Exception as e:
-        logger.error(f"Error in wind calculations: {str(e)}")
+        logger.error("Error in wind calculations: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
     
+async def _assess_wind(request: WindDataRequest) -> WindDataResponse:
+    # Called outside FastAPI's dependency injection, so resolve the cache dependency here
+    return await process_wind_data(request, await cached_wind_result(request))
+
+async def _assess_site(lat: float, lon: float):
+    # The solar and wind assessments share no data, so run them concurrently
+    solar_assessment_request = SolarAssessmentRequest(latitude=lat, longitude=lon)
+    wind_assessment_request = WindDataRequest(lat=lat, lon=lon, height=100, date_from="2019-01-01", date_to="2019-01-31")
+    return await asyncio.gather(
+        calculate_solar_potential(solar_assessment_request),
+        _assess_wind(wind_assessment_request)
+    )
+
+def _retrieve_task_exception(task: asyncio.Task) -> None:
+    # If every waiter was cancelled before the shared run failed, nobody else reads its
+    # exception; retrieving it here stops asyncio logging "Task exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
+
 @app.post("/combined_assessment", response_model=CombinedAssessmentResponse)
 async def combined_assessment(request: CombinedAssessmentRequest):
     try:
         # Step 1: Fetch coordinates for the city
-        coordinates_response = await get_coordinates(LocationRequest(city_name=request.city_name))
+        coordinates_response = await resolve_coordinates(request.city_name)
         lat, lon = coordinates_response.latitude, coordinates_response.longitude
 
-        # Step 2: Perform solar assessment
-        solar_assessment_request = SolarAssessmentRequest(latitude=lat, longitude=lon)
-        solar_result = calculate_solar_potential(solar_assessment_request)
-
-        # Step 3: Perform wind assessment
-        wind_assessment_request = WindDataRequest(lat=lat, lon=lon, height=100, date_from="2019-01-01", date_to="2019-01-31")
-        wind_result = process_wind_data(wind_assessment_request)
-
-        # Step 4: Return combined results
+        # Step 2: Perform the assessments, sharing one run between concurrent requests for the same site
+        key = (round(lat, 2), round(lon, 2))
+        task = _inflight_assessments.get(key)
+        if task is None:
+            task = asyncio.create_task(_assess_site(lat, lon))
+            _inflight_assessments[key] = task
+            task.add_done_callback(lambda _: _inflight_assessments.pop(key, None))
+            task.add_done_callback(_retrieve_task_exception)
+        # Shield the shared run so one client disconnecting doesn't cancel it for the others
+        solar_result, wind_result = await asyncio.shield(task)
+
+        # Step 3: Return combined results
         return CombinedAssessmentResponse(
             solar_assessment=solar_result,
             wind_assessment=wind_result
         )
 
     except HTTPException as he:
-        logger.error(f"HTTPException occurred: {he.detail}")
+        logger.error("HTTPException occurred: %s", he.detail)
         raise he
     except Exception as e:
-        logger.error(f"Error in combined assessment: {str(e)}")
+        logger.error("Error in combined assessment: %s", e)
         raise HTTPException(status_code=500, detail="Error in combined assessment")
@@ -12,11 +12,6 @@ class ChatResponse(BaseModel):
     solar_assessment: Optional[SolarAssessmentResponse] = None
     wind_assessment: Optional[WindDataResponse] = None
 
-# app/models/combined_assessment.py
-from pydantic import BaseModel
-from .solar_assessment import SolarAssessmentResponse
-from .wind import WindDataResponse
-
 class CombinedAssessmentRequest(BaseModel):
     city_name: str
 
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
 
 class Location(BaseModel): 
     latitude: float = Field(..., example=37.7749)
@@ -18,6 +18,8 @@ class UtilityRatesRequest(BaseModel):
     location: Location
 
 class SolarAssessmentRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     city_name: Optional[str] = Field(None, description="City name for geolocation")
     latitude: Optional[float] = Field(None, description="Latitude of the location")
     longitude: Optional[float] = Field(None, description="Longitude of the location")
@@ -32,4 +34,20 @@ class SolarAssessmentResponse(BaseModel):
     co2_reduction: float = Field(..., description="Annual CO2 reduction (kg)")
 
 class LocationRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     city_name: str
+
+class SolarBatchRequest(BaseModel):
+    ac_annual: List[float] = Field(..., description="Annual AC system output per location (kWhac)")
+    solrad_annual: List[float] = Field(..., description="Annual solar radiation per location (kWh/m²/day)")
+    losses: List[float] = Field(..., description="System losses per location in percentage")
+    energy_price: List[float] = Field(..., description="Energy price per location (USD/kWh)")
+    carbon_intensity: List[float] = Field(..., description="Carbon intensity per location (gCO2eq/kWh)")
+    system_capacity: List[float] = Field(..., description="System capacity per location in kW")
+
+class SolarBatchResponse(BaseModel):
+    panel_area: List[float] = Field(..., description="Required panel area per location (m²)")
+    annual_cost_savings: List[float] = Field(..., description="Annual cost savings per location (USD)")
+    roi_years: List[float] = Field(..., description="Return on Investment per location (years)")
+    co2_reduction: List[float] = Field(..., description="Annual CO2 reduction per location (kg)")
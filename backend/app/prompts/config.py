@@ -1,28 +1,31 @@
 # prompts/config.py
 
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+from functools import lru_cache
 from pathlib import Path
 import yaml
 
-class PromptConfig:
-    def __init__(self):
-        self.config_dir = Path(__file__).parent
-        self.prompts = self._load_prompts()
-        self.templates = self._load_templates()
+CONFIG_DIR = Path(__file__).parent
 
-    def _load_prompts(self) -> Dict[str, str]:
-        with open(self.config_dir / "prompts.yaml", "r") as f:
-            return yaml.safe_load(f)
+# The YAML files don't change at runtime; parse each once per process
+@lru_cache(maxsize=None)
+def _load_yaml(name: str) -> Dict[str, Any]:
+    with open(CONFIG_DIR / name, "r") as f:
+        return yaml.safe_load(f)
 
-    def _load_templates(self) -> Dict[str, str]:
-        with open(self.config_dir / "templates.yaml", "r") as f:
-            return yaml.safe_load(f)
+class PromptConfig:
+    def __init__(self):
+        self.config_dir = CONFIG_DIR
+        self.prompts = _load_yaml("prompts.yaml")
+        self.templates = _load_yaml("templates.yaml")["templates"]
 
     def get_system_prompt(self) -> str:
         return self.prompts["system_prompt"]
 
-    def get_assessment_prompt(self) -> str:
-        return self.prompts["assessment_prompt"]
+    def get_assessment_prompt(self) -> Tuple[str, str]:
+        """Returns (system_text, user_template) for the assessment classifier."""
+        prompt = self.prompts["assessment_prompt"]
+        return prompt["system"], prompt["user"]
 
     def get_template(self, template_name: str) -> str:
         return self.templates.get(template_name, "")
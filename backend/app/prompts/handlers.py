@@ -1,51 +1,65 @@
 # app/prompts/handlers.py
 
-import os
-import aiohttp
+import re
+import orjson
 from fastapi import logger
 
 from app.prompts.config import PromptConfig
+from app.utils.cache import TTLCache
+from app.utils.config import settings
+from app.utils.http import get_http_session
+from app.utils.text import normalise_key
+
+# Phrases that introduce a location, e.g. "calculate the energy in <location>"
+_LOCATION_RE = re.compile(
+    r"(?:calculate (?:the )?energy (?:for|in)|energy (?:calculation|assessment) for|assess energy in|what is the energy in)\s+(.+)"
+)
+
+# Classifications of recently seen messages, shared by every handler instance
+_assessment_cache = TTLCache(maxsize=1024, ttl=3600)
 
 class PromptHandler:
-    def __init__(self):
-        self.config = PromptConfig()
+    # Shared by every handler instance; the prompt files are read once per process
+    config = PromptConfig()
 
     async def check_assessment_and_location(self, user_message: str) -> tuple[bool, str]:
         """
         Checks if an assessment should be run and returns the location if applicable.
         Returns a tuple of (should_run_assessment: bool, location: str)
         """
-        assessment_prompt = self.config.get_assessment_prompt().format(
-            user_message=user_message
-        )
+        cache_key = normalise_key(user_message)
+        cached = _assessment_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        system_text, user_template = self.config.get_assessment_prompt()
         
         try:
             headers = {
-                "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}",
+                "Authorization": f"Bearer {settings.openai_api_key}",
                 "Content-Type": "application/json"
             }
             
             data = {
                 "model": "gpt-3.5-turbo",
-                "messages": [{
-                    "role": "user",
-                    "content": assessment_prompt
-                }]
+                "messages": [
+                    {"role": "system", "content": system_text},
+                    {"role": "user", "content": user_template.format(user_message=user_message)}
+                ]
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers=headers,
-                    json=data
-                ) as response:
-                    response_data = await response.json()
-                    location = response_data["choices"][0]["message"]["content"].strip()
-                    
-                    if location == "NO_ASSESSMENT":
-                        return False, ""
-                    else:
-                        return True, location
+            # Reuse the app-wide pooled session so the TLS connection to OpenAI stays alive between calls
+            async with get_http_session().post(
+                "https://api.openai.com/v1/chat/completions",
+                headers=headers,
+                json=data
+            ) as response:
+                response_data = orjson.loads(await response.read())
+                location = response_data["choices"][0]["message"]["content"].strip()
+                
+                result = (False, "") if location == "NO_ASSESSMENT" else (True, location)
+                _assessment_cache.set(cache_key, result)
+                return result
 
         except Exception as e:
             return False, ""
@@ -53,23 +67,10 @@ class PromptHandler:
     def extract_location(self, user_message: str) -> str:
         """Extract location name from user message."""
         user_message = user_message.lower()
-        
-        # List of phrases to remove
-        remove_phrases = [
-            "calculate energy for",
-            "calculate energy in",
-            "calculate the energy for",
-            "calculate the energy in",
-            "energy calculation for",
-            "energy assessment for",
-            "assess energy in",
-            "what is the energy in"
-        ]
-        
-        # Remove each phrase if present
-        for phrase in remove_phrases:
-            if phrase in user_message:
-                return user_message.replace(phrase, "").strip()
+
+        match = _LOCATION_RE.search(user_message)
+        if match:
+            return match.group(1).strip()
         
         # If no phrase found, try to extract the last word or phrase
         words = user_message.split()
@@ -1,15 +1,20 @@
-import requests
 from fastapi import HTTPException
 from app.utils.constants import ELECTRICITYMAP_BASE_URL
-import os
+from app.utils.cache import TTLCache
+from app.utils.config import settings
+from app.utils.http import get_http_session
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
-ELECTRICITYMAP_API_KEY = os.getenv("ELECTRICITYMAP_API_KEY")
+ELECTRICITYMAP_API_KEY = settings.electricitymap_api_key
 DEFAULT_CARBON_INTENSITY = 500.0  # Default value in gCO2eq/kWh
 
-def get_carbon_intensity(lat: float, lon: float) -> float:
+# Carbon intensity moves on the scale of hours; cache per ~0.1° grid cell
+_carbon_intensity_cache = TTLCache(maxsize=4096, ttl=3600)
+
+async def get_carbon_intensity(lat: float, lon: float) -> float:
     """
     Fetches the carbon intensity for the given location from ElectricityMap API.
     Falls back to default value if API call fails.
@@ -18,6 +23,11 @@ def get_carbon_intensity(lat: float, lon: float) -> float:
     :param lon: Longitude of the location
     :return: Carbon intensity in gCO2eq/kWh
     """
+    cache_key = (round(lat, 1), round(lon, 1))
+    cached = _carbon_intensity_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         url = f"{ELECTRICITYMAP_BASE_URL}/carbon-intensity/latest"
         headers = {
@@ -28,18 +38,21 @@ def get_carbon_intensity(lat: float, lon: float) -> float:
             "lon": lon
         }
 
-        response = requests.get(url, headers=headers, params=params)
-        
-        if response.status_code == 200:
-            data = response.json()
+        async with get_http_session().get(url, headers=headers, params=params) as response:
+            status = response.status
+            data = orjson.loads(await response.read()) if status == 200 else None
+
+        if data is not None:
             carbon_intensity = data.get("carbonIntensity")
             if carbon_intensity is not None:
-                return float(carbon_intensity)
+                carbon_intensity = float(carbon_intensity)
+                _carbon_intensity_cache.set(cache_key, carbon_intensity)
+                return carbon_intensity
         
         # If we get here, either the request failed or data was missing
         logger.warning(
             f"Using default carbon intensity ({DEFAULT_CARBON_INTENSITY} gCO2eq/kWh) for location "
-            f"lat={lat}, lon={lon}. API Status: {response.status_code}"
+            f"lat={lat}, lon={lon}. API Status: {status}"
         )
         return DEFAULT_CARBON_INTENSITY
 
@@ -1,22 +1,34 @@
-import requests
 from fastapi import HTTPException
 from app.utils.constants import NREL_PVWatts_BASE_URL
 from app.models.solar_assessment import PVWattsRequest
-from dotenv import load_dotenv
-import os
+from app.utils.cache import TTLCache
+from app.utils.config import settings
+from app.utils.http import get_http_session
 import logging
+import orjson
 
-load_dotenv()
+NREL_API_KEY = settings.nrel_api_key
 
-NREL_API_KEY = os.getenv("NREL_API_KEY")
+# PVWatts models typical-year weather, so output only changes with the system spec
+# and location; cache per ~0.01° grid cell
+_pvwatts_cache = TTLCache(maxsize=4096, ttl=86400)
 
-def get_pvwatts_data(pv_request: PVWattsRequest) -> dict:
+async def get_pvwatts_data(pv_request: PVWattsRequest) -> dict:
     """
     Fetches PVWatts solar potential data from NREL API.
 
     :param pv_request: PVWattsRequest object containing system specifications and location
     :return: Dictionary containing PVWatts output data
     """
+    cache_key = (
+        pv_request.system_capacity, pv_request.module_type, pv_request.losses,
+        pv_request.array_type, pv_request.tilt, pv_request.azimuth,
+        round(pv_request.location.latitude, 2), round(pv_request.location.longitude, 2)
+    )
+    cached = _pvwatts_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     params = {
         "format": "json",
         "api_key": NREL_API_KEY,
@@ -30,14 +42,15 @@ def get_pvwatts_data(pv_request: PVWattsRequest) -> dict:
         "lon": pv_request.location.longitude
     }
 
-    response = requests.get(NREL_PVWatts_BASE_URL, params=params)
-    if response.status_code != 200:
-        logging.error(f"PVWatts API call failed. Status Code: {response.status_code}, Response: {response.text}")
-        raise HTTPException(status_code=500, detail="Failed to fetch PVWatts data.")
+    async with get_http_session().get(NREL_PVWatts_BASE_URL, params=params) as response:
+        if response.status != 200:
+            logging.error(f"PVWatts API call failed. Status Code: {response.status}, Response: {await response.text()}")
+            raise HTTPException(status_code=500, detail="Failed to fetch PVWatts data.")
 
-    data = response.json()
+        data = orjson.loads(await response.read())
     outputs = data.get("outputs")
     if not outputs:
         raise HTTPException(status_code=500, detail="PVWatts output data unavailable.")
 
+    _pvwatts_cache.set(cache_key, outputs)
     return outputs
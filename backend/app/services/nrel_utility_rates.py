@@ -1,12 +1,14 @@
-import requests
 from fastapi import HTTPException
 from app.utils.constants import NREL_UTILITY_RATES_URL
-import os
+from app.utils.cache import TTLCache
+from app.utils.config import settings
+from app.utils.http import get_http_session
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
-NREL_API_KEY = os.getenv("NREL_API_KEY")
+NREL_API_KEY = settings.nrel_api_key
 DEFAULT_RATES = {
     "utility_name": "Default Utility",
     "residential": 0.12,  # Default residential rate in USD/kWh
@@ -14,7 +16,10 @@ DEFAULT_RATES = {
     "industrial": 0.10    # Default industrial rate in USD/kWh
 }
 
-def get_utility_rates(lat: float, lon: float) -> dict:
+# Utility rates change on the scale of months; cache per ~0.1° grid cell for a day
+_utility_rates_cache = TTLCache(maxsize=4096, ttl=86400)
+
+async def get_utility_rates(lat: float, lon: float) -> dict:
     """
     Fetches utility rates for residential, commercial, and industrial sectors from NREL API.
     Falls back to default values if data is unavailable.
@@ -23,6 +28,11 @@ def get_utility_rates(lat: float, lon: float) -> dict:
     :param lon: Longitude of the location
     :return: Dictionary containing utility rates
     """
+    cache_key = (round(lat, 1), round(lon, 1))
+    cached = _utility_rates_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         params = {
             "format": "json", 
@@ -31,10 +41,11 @@ def get_utility_rates(lat: float, lon: float) -> dict:
             "lon": lon
         }
 
-        response = requests.get(NREL_UTILITY_RATES_URL, params=params)
-        
-        if response.status_code == 200:
-            data = response.json()
+        async with get_http_session().get(NREL_UTILITY_RATES_URL, params=params) as response:
+            status = response.status
+            data = orjson.loads(await response.read()) if status == 200 else None
+
+        if data is not None:
             outputs = data.get("outputs")
             
             if outputs:
@@ -46,17 +57,19 @@ def get_utility_rates(lat: float, lon: float) -> dict:
                 if residential_rate not in [None, 'no data'] and \
                    commercial_rate not in [None, 'no data'] and \
                    industrial_rate not in [None, 'no data']:
-                    return {
+                    rates = {
                         "utility_name": outputs.get("utility_name", DEFAULT_RATES["utility_name"]),
                         "residential": float(residential_rate),
                         "commercial": float(commercial_rate),
                         "industrial": float(industrial_rate)
                     }
+                    _utility_rates_cache.set(cache_key, rates)
+                    return rates
         
         # If we get here, either the request failed or data was invalid
         logger.warning(
             f"Using default utility rates for location lat={lat}, lon={lon}. "
-            f"API Status: {response.status_code}"
+            f"API Status: {status}"
         )
         return DEFAULT_RATES
 
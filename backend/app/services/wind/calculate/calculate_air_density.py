@@ -4,25 +4,34 @@ import pandas as pd
 import os
 import numpy as np
 
+R_D = 287.05    # J/(kg·K) for dry air
+R_V = 461.495   # J/(kg·K) for water vapor
+_INV_R_D = 1.0 / R_D
+_INV_R_V = 1.0 / R_V
+_E0_PA = 6.112 * 100  # Saturation vapour pressure at 0 °C, hPa converted to Pa
+
 def calculate_air_density(temperature, pressure_pa, dewpoint):
     """
     Calculate air density based on temperature (K), pressure (Pa), and dewpoint (K).
     """
-    R_d = 287.05    # J/(kg·K) for dry air
-    R_v = 461.495   # J/(kg·K) for water vapor
     T_celsius = dewpoint - 273.15  # Dewpoint in Celsius
 
-    e_s_pa = 6.112 * np.exp((17.67 * T_celsius) / (T_celsius + 243.5)) * 100  # Convert hPa to Pa
-    rho = ((pressure_pa - e_s_pa) / (R_d * temperature)) + (e_s_pa / (R_v * temperature))
+    e_s_pa = _E0_PA * np.exp((17.67 * T_celsius) / (T_celsius + 243.5))
+    # Divide by temperature once and multiply by the precomputed gas-constant reciprocals
+    inv_t = 1.0 / temperature
+    rho = ((pressure_pa - e_s_pa) * _INV_R_D + e_s_pa * _INV_R_V) * inv_t
     return rho
 
 def calculate_air_density_from_nc(nc_file='data/era5.nc', output_csv='data/air_density_january_2019.csv'):
     """
-    Calculate air density from ERA5 NetCDF data and save it to a CSV file.
+    Calculate air density from ERA5 NetCDF data and optionally save it to a CSV file.
 
     Parameters:
     - nc_file (str): Path to the ERA5 NetCDF file.
-    - output_csv (str): Path to save the air density CSV file.
+    - output_csv (str or None): Path to save the air density CSV file; None keeps the result in memory only.
+
+    Returns:
+    - df_air_density (DataFrame): 'datetime' and 'air_density' columns.
     """
     if not os.path.exists(nc_file):
         print(f"Error: NetCDF file '{nc_file}' not found.")
@@ -34,29 +43,36 @@ def calculate_air_density_from_nc(nc_file='data/era5.nc', output_csv='data/air_d
         print(f"Error: Failed to load the NetCDF file: {e}")
         raise
 
-    try:
-        # Update 'time' dimension to 'valid_time' if necessary
-        time_var = 'valid_time' if 'valid_time' in ds.dims else 'time'
-
-        # Extract relevant data using the detected time variable
-        times = ds[time_var].values
-        temp_k = ds['t2m'].mean(dim=('latitude', 'longitude')).values
-        dewpoint_k = ds['d2m'].mean(dim=('latitude', 'longitude')).values
-        pressure_pa = ds['sp'].mean(dim=('latitude', 'longitude')).values
-    except KeyError as e:
-        print(f"Error: Variable '{e}' not found in the dataset.")
-        raise
-    except Exception as e:
-        print(f"Error: An unexpected error occurred while extracting variables: {e}")
-        raise
+    with ds:
+        try:
+            # Update 'time' dimension to 'valid_time' if necessary
+            time_var = 'valid_time' if 'valid_time' in ds.dims else 'time'
+
+            # Average over the grid once, up front, so only (T,) series are ever loaded
+            grid_mean = ds[['t2m', 'd2m', 'sp']].mean(dim=('latitude', 'longitude'))
+            times = grid_mean[time_var].values
+            # float32 is ample for these fields and halves every array the formula touches
+            temp_k = grid_mean['t2m'].values.astype(np.float32, copy=False)
+            dewpoint_k = grid_mean['d2m'].values.astype(np.float32, copy=False)
+            pressure_pa = grid_mean['sp'].values.astype(np.float32, copy=False)
+        except KeyError as e:
+            print(f"Error: Variable '{e}' not found in the dataset.")
+            raise
+        except Exception as e:
+            print(f"Error: An unexpected error occurred while extracting variables: {e}")
+            raise
 
     air_density = calculate_air_density(temp_k, pressure_pa, dewpoint_k)
 
     df_air_density = pd.DataFrame({
-        'datetime': pd.to_datetime(times),
+        # ERA5 times are already datetime64[ns]; wrap them without reparsing or copying
+        'datetime': pd.DatetimeIndex(times, copy=False),
         'air_density': air_density
     })
 
+    if output_csv is None:
+        return df_air_density
+
     try:
         os.makedirs(os.path.dirname(output_csv), exist_ok=True)  # Ensure the data directory exists
         df_air_density.to_csv(output_csv, index=False)
@@ -65,8 +81,11 @@ def calculate_air_density_from_nc(nc_file='data/era5.nc', output_csv='data/air_d
         print(f"Failed to save air density data to CSV: {e}")
         raise
 
+    return df_air_density
+
 def main():
-    nc_file = 'data/era5.nc'
+    # fetch_era5_data names its output per site and day; pass that path as the first argument
+    nc_file = sys.argv[1] if len(sys.argv) > 1 else 'data/era5.nc'
     output_csv = 'data/air_density_january_2019.csv'
     calculate_air_density_from_nc(nc_file, output_csv)
     print("Air Density Calculation Script Completed.")
@@ -1,16 +1,19 @@
+from app.services.wind.calculate.merge_and_calculate_power import total_energy_kwh
+
 def calculate_capacity_factor(df, rated_power=10):
     """
     Calculate the capacity factor of the wind turbine.
     
     Parameters:
-    - df (DataFrame): DataFrame containing the 'energy_kwh' column
+    - df (DataFrame or ndarray): DataFrame containing the hourly 'power_kw' column, or the hourly
+      energy values as an array
     - rated_power (float): Rated power of the turbine in kW (default 10kW)
     
     Returns:
     - capacity_factor (float): Capacity factor as a percentage
     """
     # Calculate annual energy from monthly data
-    annual_energy = df['energy_kwh'].sum() * 12  # Convert monthly to annual
+    annual_energy = total_energy_kwh(df) * 12  # Convert monthly to annual
     
     # Calculate theoretical maximum annual energy
     max_annual_energy = rated_power * 8760  # 8760 hours in a year
@@ -22,12 +25,12 @@ def calculate_capacity_factor(df, rated_power=10):
     MAX_CAPACITY_FACTOR = 35.0
     return min(capacity_factor, MAX_CAPACITY_FACTOR)
 
-def calculate_wind_cost_savings(total_energy_kwh: float, energy_price: float) -> float:
+def calculate_wind_cost_savings(annual_energy_kwh: float, energy_price: float) -> float:
     """
     Calculate annual cost savings from wind energy.
     
     Parameters:
-    - total_energy_kwh (float): Annual energy production in kWh
+    - annual_energy_kwh (float): Annual energy production in kWh
     - energy_price (float): Energy price in USD/kWh (typically 0.10-0.15)
     
     Returns:
@@ -38,4 +41,4 @@ def calculate_wind_cost_savings(total_energy_kwh: float, energy_price: float) ->
     MAX_RATE = 0.20
     validated_rate = min(max(energy_price, MIN_RATE), MAX_RATE)
     
-    return total_energy_kwh * validated_rate
\ No newline at end of file
+    return annual_energy_kwh * validated_rate
\ No newline at end of file
@@ -38,51 +38,100 @@ def apply_power_curve(wind_speed, air_density, rotor_radius=3.5, rated_power=10,
     else:
         return rated_power
 
+def power_curve(wind_speed, air_density, rotor_radius=3.5, rated_power=10, Cp=0.35):
+    """
+    Vectorised form of apply_power_curve over arrays of wind speeds.
+    Matches it for every finite speed. A missing (NaN) speed gives 0 kW here, whereas
+    apply_power_curve falls through its comparisons and returns rated_power.
+
+    Parameters:
+    - wind_speed (ndarray): Wind speeds in m/s; float32 input gives float32 output
+    - air_density (float or ndarray): Air density in kg/m³, broadcast against wind_speed
+    - rotor_radius (float): Radius of the turbine rotor in meters
+    - rated_power (float): Rated power output of the turbine in kW
+    - Cp (float): Power coefficient
+
+    Returns:
+    - power (ndarray): Power output in kW for each wind speed
+    """
+    cut_in_speed = 3.0
+    rated_speed = 12.0
+    cut_out_speed = 20.0
+
+    # Keep float32 input as float32; the scalar constants below don't upcast it
+    v = np.asarray(wind_speed)
+    if v.dtype.kind != 'f':
+        v = v.astype(np.float64)
+    swept_area = np.pi * rotor_radius ** 2
+    # Fold the constants into one coefficient and cube by multiplication rather than np.power
+    coefficient = 0.5 * swept_area * Cp / 1000 * air_density
+
+    # NaN speeds compare False against every limit and stay at zero power
+    power = np.zeros(v.shape, dtype=np.result_type(v, coefficient))
+    power[(v >= rated_speed) & (v < cut_out_speed)] = rated_power
+    # Only hours between cut-in and rated speed need the cubic; the rest are 0 or rated power
+    active = (v >= cut_in_speed) & (v < rated_speed)
+    if np.ndim(coefficient):
+        coefficient = np.broadcast_to(coefficient, v.shape)[active]
+    v_active = v[active]
+    # Build the cube in one buffer and update it in place instead of allocating a temporary per step
+    cube = np.multiply(v_active, v_active, dtype=power.dtype)
+    cube *= v_active
+    cube *= coefficient
+    np.minimum(cube, rated_power, out=cube)
+    power[active] = cube
+    return power
+
 def merge_and_calculate_power(wind_data_file='data/wind_data.csv',
                             air_density_file='data/air_density_january_2019.csv',
                             output_file='data/merged_power_data.csv',
                             rotor_radius=3.5,
                             rated_power=10,
-                            Cp=0.35):
+                            Cp=0.35,
+                            df_wind=None,
+                            df_air_density=None):
     """
     Merge wind speed and air density data, then calculate power and energy output.
     
     Parameters:
     - wind_data_file (str): Path to wind data CSV
     - air_density_file (str): Path to air density CSV
-    - output_file (str): Path for merged output CSV
+    - output_file (str or None): Path for merged output CSV; None skips writing it
     - rotor_radius (float): Turbine rotor radius in meters
     - rated_power (float): Rated power in kW
     - Cp (float): Power coefficient
+    - df_wind (DataFrame, optional): Wind data already in memory; skips reading wind_data_file
+    - df_air_density (DataFrame, optional): Air density already in memory; skips reading air_density_file
     """
     try:
         # Load the wind data
-        df_wind = pd.read_csv(wind_data_file, parse_dates=['datetime'])
+        if df_wind is None:
+            df_wind = pd.read_csv(wind_data_file, parse_dates=['datetime'], dtype={'wind_speed': np.float32})
         
         # Load air density data
-        df_air_density = pd.read_csv(air_density_file, parse_dates=['datetime'])
-        mean_air_density = df_air_density['air_density'].mean()
+        if df_air_density is None:
+            # Only the mean density is used, so skip the timestamp column entirely
+            df_air_density = pd.read_csv(air_density_file, usecols=['air_density'], dtype={'air_density': np.float32})
+        # A Python float, so it scales the float32 wind speeds without promoting them.
+        # Reduced on the raw array, accumulating the float32 densities in float64
+        mean_air_density = float(np.nanmean(df_air_density['air_density'].to_numpy(), dtype=np.float64))
         
-        logger.info(f"Using mean air density: {mean_air_density:.4f} kg/m³")
+        logger.info("Using mean air density: %.4f kg/m³", mean_air_density)
         
         # Calculate power for each wind speed
-        df_wind['power_kw'] = df_wind['wind_speed'].apply(
-            lambda ws: apply_power_curve(
-                wind_speed=ws,
-                air_density=mean_air_density,
-                rotor_radius=rotor_radius,
-                rated_power=rated_power,
-                Cp=Cp
-            )
+        df_wind['power_kw'] = power_curve(
+            df_wind['wind_speed'].to_numpy(dtype=np.float32),
+            mean_air_density,
+            rotor_radius=rotor_radius,
+            rated_power=rated_power,
+            Cp=Cp
         )
         
-        # Calculate energy (kWh) assuming hourly data
-        df_wind['energy_kwh'] = df_wind['power_kw']  # kW * 1 hour = kWh
-        
         # Save merged data
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        df_wind.to_csv(output_file, index=False)
-        logger.info(f"Merged power data saved to {output_file}")
+        if output_file is not None:
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            df_wind.to_csv(output_file, index=False)
+            logger.info("Merged power data saved to %s", output_file)
         
         return df_wind
         
@@ -90,18 +139,29 @@ def merge_and_calculate_power(wind_data_file='data/wind_data.csv',
         logger.error(f"Error in merge_and_calculate_power: {str(e)}")
         raise
 
-def calculate_wind_metrics(df_power: pd.DataFrame, 
+def total_energy_kwh(df_power) -> float:
+    """
+    Sum the hourly energy of a merged power run.
+    The data is hourly, so each power_kw value is also that hour's energy in kWh.
+    Reduces on the underlying float buffer rather than through pandas' Series.sum().
+
+    Parameters:
+    - df_power (DataFrame or ndarray): Merged power data with a 'power_kw' column,
+      or the hourly energy values themselves
+    """
+    energy = df_power['power_kw'].to_numpy() if isinstance(df_power, pd.DataFrame) else np.asarray(df_power)
+    # Accumulate in float64 so summing a float32 column loses no precision
+    return float(np.add.reduce(energy, dtype=np.float64))
+
+def calculate_wind_metrics(monthly_energy: float,
                          energy_price: float,
                          rated_power: float = 10.0,
                          installation_cost: float = 25000.0) -> Dict[str, float]:
     """
-    Calculate comprehensive wind power metrics from power data.
+    Calculate comprehensive wind power metrics from the total energy of a month of power data.
     Adjusted for NYC location characteristics.
     """
     try:
-        # Calculate monthly energy
-        monthly_energy = df_power['energy_kwh'].sum()
-        
         # Annualize energy production
         annual_energy = monthly_energy * 12
         
@@ -0,0 +1,9 @@
+class WindDataUnavailable(Exception):
+    """
+    Raised by the wind fetchers when upstream data cannot be retrieved.
+    Carries the HTTP status the API should answer with.
+    """
+
+    def __init__(self, detail: str, status_code: int = 500):
+        super().__init__(detail)
+        self.status_code = status_code
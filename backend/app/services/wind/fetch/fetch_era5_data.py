@@ -1,16 +1,30 @@
-import sys
 import cdsapi
+import glob
 import os
-from dotenv import load_dotenv
+import tempfile
+import time
+import requests
 
+from app.utils.config import settings
+from app.utils.constants import CDS_API_URL
+from app.services.wind.errors import WindDataUnavailable
 
-sys.path.append('/Users/westonvoglesonger/Projects/EcoNomics/backend')
+cdsapi_key = settings.cdsapi_key
 
-from app.utils.constants import CDS_API_URL
+# Downloaded days kept on disk; the oldest files beyond this are deleted
+MAX_CACHED_FILES = 32
+
+# Files downloaded or reused this recently are never evicted, so a request still reading one keeps it
+EVICTION_GRACE_SECONDS = 300
+
+# Created on first download and reused, so later retrievals keep the client's HTTP session
+_client = None
 
-# Load environment variables from .env file
-load_dotenv()
-cdsapi_key = os.getenv("CDSAPI_KEY")
+def get_client():
+    global _client
+    if _client is None:
+        _client = cdsapi.Client(url=CDS_API_URL, key=cdsapi_key)
+    return _client
 
 def get_bounding_box(lat, lon, buffer_deg=0.25):
     north = min(lat + buffer_deg, 90)
@@ -19,19 +33,62 @@ def get_bounding_box(lat, lon, buffer_deg=0.25):
     west = max(lon - buffer_deg, -180)
     return [north, west, south, east]
 
-def fetch_data(lat, lon, buffer_deg, year, month, day, output_dir='data/'):
-    c = cdsapi.Client(url=CDS_API_URL, key=cdsapi_key)
-    
-    area = get_bounding_box(lat, lon, buffer_deg)
-    print(f"Bounding Box: North={area[0]}, West={area[1]}, South={area[2]}, East={area[3]}")
+def era5_file_path(lat, lon, year, month, day, output_dir='data/'):
+    """
+    Path of the NetCDF file for one day at a site, keyed on the location rounded to 0.01°.
+    """
+    return os.path.join(output_dir, f"era5_{lat:.2f}_{lon:.2f}_{year}{month}{day}.nc")
+
+def evict_old_files(output_dir='data/', max_files=MAX_CACHED_FILES, grace_seconds=EVICTION_GRACE_SECONDS):
+    """
+    Delete the oldest downloaded ERA5 files so at most max_files remain.
+    Files used within the last grace_seconds are kept even when that leaves more than max_files.
+    """
+    files = []
+    for path in glob.glob(os.path.join(output_dir, 'era5_*.nc')):
+        try:
+            files.append((os.path.getmtime(path), path))
+        except FileNotFoundError:
+            pass  # Already evicted by another worker
+    files.sort()
+    cutoff = time.time() - grace_seconds
+    for mtime, path in files[:-max_files]:
+        if mtime >= cutoff:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # Already evicted by another worker
 
+def fetch_data(lat, lon, buffer_deg, year, month, day, output_dir='data/', overwrite=False):
+    """
+    Download ERA5 temperature, dewpoint and surface pressure for one day around a site.
+    A file already downloaded for the same rounded location and day is reused.
+
+    Returns:
+    - output_file (str): Path of the NetCDF file
+    """
     os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, 'era5.nc')
+    output_file = era5_file_path(lat, lon, year, month, day, output_dir)
+
+    if not overwrite:
+        try:
+            # Touching the file marks it recently used, which keeps it out of eviction while it is read
+            os.utime(output_file)
+        except FileNotFoundError:
+            pass  # Not downloaded yet, or evicted since: download it
+        else:
+            print(f"Data for {year}-{month}-{day} already exists at '{output_file}'. Skipping download.")
+            return output_file
 
-    if os.path.exists(output_file):
-        print(f"Data for {year}-{month}-{day} already exists at '{output_file}'. Skipping download.")
-        return
+    c = get_client()
 
+    area = get_bounding_box(lat, lon, buffer_deg)
+    print(f"Bounding Box: North={area[0]}, West={area[1]}, South={area[2]}, East={area[3]}")
+
+    # Download under a unique name and swap it in, so concurrent requests never read a partial file
+    fd, tmp_file = tempfile.mkstemp(suffix='.part', dir=output_dir)
+    os.close(fd)
     try:
         print(f"Starting data retrieval for {year}-{month}-{day}...")
         c.retrieve(
@@ -50,14 +107,24 @@ def fetch_data(lat, lon, buffer_deg, year, month, day, output_dir='data/'):
                 'area': area,
                 'format': 'netcdf',
             },
-            output_file
+            tmp_file
         )
+        os.replace(tmp_file, output_file)
         print(f"Data retrieval successful. File saved as '{output_file}'.")
+    except requests.exceptions.RequestException as e:
+        print(f"Data retrieval failed: {e}")
+        raise WindDataUnavailable("ERA5 data service is currently unavailable. Please try again later.") from e
     except Exception as e:
         print(f"Data retrieval failed: {e}")
         raise
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+    evict_old_files(output_dir)
+    return output_file
 
 def main(lat, lon, height, date_from, date_to):
     year, month, day = date_from.split('-')
-    fetch_data(lat, lon, 0.25, year, month, day)
-    print("ERA5 Data Retrieval Completed.")
\ No newline at end of file
+    output_file = fetch_data(lat, lon, 0.25, year, month, day)
+    print(f"ERA5 Data Retrieval Completed: {output_file}")
\ No newline at end of file
@@ -1,14 +1,29 @@
 import sys
 import requests
+import numpy as np
 import pandas as pd
 import os
 from datetime import datetime
-from io import StringIO
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.services.wind.errors import WindDataUnavailable
+
+# One pooled session per process so repeat requests reuse the keep-alive connection.
+# 500 is deliberately not retried: the Wind Atlas uses it for points outside its coverage.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504], raise_on_status=False)
+)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
 
 
 def fetch_wind_data(lat, lon, height, date_from, date_to, output_file='data/wind_data.csv'):
     """
-    Retrieve wind speed data from the Wind Atlas API and save it to a CSV file.
+    Retrieve wind speed data from the Wind Atlas API and optionally save it to a CSV file.
 
     Parameters:
     - lat (float): Latitude of the location.
@@ -16,7 +31,10 @@ def fetch_wind_data(lat, lon, height, date_from, date_to, output_file='data/wind
     - height (int): Height above ground level in meters for wind data.
     - date_from (str): Start date in 'YYYY-MM-DD' format.
     - date_to (str): End date in 'YYYY-MM-DD' format.
-    - output_file (str): Name of the output CSV file.
+    - output_file (str or None): Name of the output CSV file; None skips writing it.
+
+    Returns:
+    - df (DataFrame): The wind data.
     """
     url = f"http://windatlas.xyz/api/wind/?lat={lat}&lon={lon}&height={height}&date_from={date_from}&date_to={date_to}"
 
@@ -24,12 +42,13 @@ def fetch_wind_data(lat, lon, height, date_from, date_to, output_file='data/wind
         print(f"Sending request to Wind Atlas API for dates {date_from} to {date_to}...")
         
         # Send the request to the API and wait up to 60 seconds for a response
-        response = requests.get(url, timeout=60)
-        response.raise_for_status()  # Raise an error if the request failed
+        with _SESSION.get(url, timeout=60, stream=True) as response:
+            response.raise_for_status()  # Raise an error if the request failed
 
-        # Convert the CSV text from the response into a DataFrame
-        # Skips the first line if it contains metadata
-        df = pd.read_csv(StringIO(response.text), skiprows=1)
+            # Parse the CSV straight from the socket instead of decoding it into one big string first
+            # Skips the first line if it contains metadata
+            response.raw.decode_content = True  # Undo any gzip transfer encoding
+            df = pd.read_csv(response.raw, skiprows=1, dtype={'wind_speed': np.float32}, engine='c')
         print("Wind data successfully retrieved from API.")
         
         # Check that the required columns are present in the data
@@ -38,16 +57,26 @@ def fetch_wind_data(lat, lon, height, date_from, date_to, output_file='data/wind
             raise ValueError("Missing expected columns in wind data.")
         
         # Convert 'datetime' column to pandas datetime format, handling any conversion errors
-        df['datetime'] = pd.to_datetime(df['datetime'], errors='coerce')
+        # ISO8601 takes pandas' fast C path without pinning the exact separator or precision
+        df['datetime'] = pd.to_datetime(df['datetime'], format='ISO8601', errors='coerce', cache=True)
         print("Date format verified and converted successfully.")
 
+    except requests.exceptions.HTTPError as e:
+        print(f"Failed to retrieve wind data: {e}")
+        # The Wind Atlas answers 500 for points outside its coverage
+        if e.response is not None and e.response.status_code == 500:
+            raise WindDataUnavailable("We currently don't have coverage in this location.", status_code=404) from e
+        raise WindDataUnavailable("Wind data API is currently unavailable. Please try again later.") from e
     except requests.exceptions.RequestException as e:
         print(f"Failed to retrieve wind data: {e}")
-        raise  # Re-raise exception for further handling if needed
+        raise WindDataUnavailable("Wind data API is currently unavailable. Please try again later.") from e
     except Exception as e:
         print(f"An error occurred while processing wind data: {e}")
         raise
 
+    if output_file is None:
+        return df
+
     # Attempt to save the DataFrame to a CSV file
     try:
         os.makedirs(os.path.dirname(output_file), exist_ok=True)  # Ensure the data directory exists
@@ -57,6 +86,8 @@ def fetch_wind_data(lat, lon, height, date_from, date_to, output_file='data/wind
         print(f"Failed to save wind data to CSV: {e}")
         raise
 
+    return df
+
 def main(lat, lon, height, date_from, date_to):
     output_file = 'data/wind_data.csv'
     fetch_wind_data(lat, lon, height, date_from, date_to, output_file)
@@ -0,0 +1,130 @@
+import math
+import os
+import struct
+import tempfile
+from datetime import date
+from functools import lru_cache
+from typing import Optional, Tuple
+
+LAST_LOCATION_FILE = 'data/last_location.bin'
+LOCATION_THRESHOLD_KM = 50.0
+EARTH_RADIUS_KM = 6371.0
+_DEG2RAD = math.pi / 180.0
+
+# latitude, longitude, height, date_from, date_to, monthly energy (kWh).
+# The result is stored with the site it was computed for, so one atomic write keeps them paired.
+_RECORD = struct.Struct('<ddq10s10sd')
+
+# In-process copy of the record per file, keyed by the file's mtime so warm workers
+# skip the read but still see records written by other worker processes.
+# Only the event loop touches it; writes across workers are made safe by the atomic replace.
+_last_locations = {}
+
+
+def haversine(lat1, lon1, lat2, lon2, cos_lat1=None,
+              _d=_DEG2RAD, _sin=math.sin, _cos=math.cos, _asin=math.asin, _sqrt=math.sqrt):
+    """
+    Great-circle distance between two points on the Earth.
+
+    Parameters:
+    - lat1, lon1 (float): First point in decimal degrees
+    - lat2, lon2 (float): Second point in decimal degrees
+    - cos_lat1 (float, optional): Precomputed cos(lat1 in radians)
+
+    Returns:
+    - distance (float): Distance in kilometers
+    """
+    if cos_lat1 is None:
+        cos_lat1 = _cos(lat1 * _d)
+    sin_dlat = _sin((lat2 - lat1) * _d * 0.5)
+    sin_dlon = _sin((lon2 - lon1) * _d * 0.5)
+    a = sin_dlat * sin_dlat + cos_lat1 * _cos(lat2 * _d) * sin_dlon * sin_dlon
+    # 2*asin(sqrt(a)) equals 2*atan2(sqrt(a), sqrt(1-a)) with one fewer sqrt
+    return 2.0 * EARTH_RADIUS_KM * _asin(_sqrt(a))
+
+
+@lru_cache(maxsize=64)
+def _cos_lat(lat):
+    return math.cos(lat * _DEG2RAD)
+
+
+def _read_record(path: str) -> Optional[Tuple[float, float, int, str, str, float]]:
+    with open(path, 'rb') as f:
+        data = f.read(_RECORD.size)
+    if len(data) != _RECORD.size:
+        return None  # Missing, truncated or written in an older layout
+
+    lat, lon, height, date_from, date_to, monthly_energy = _RECORD.unpack(data)
+    return (lat, lon, height, date_from.rstrip(b'\0').decode('ascii'),
+            date_to.rstrip(b'\0').decode('ascii'), monthly_energy)
+
+
+def load_last_location(path: str = LAST_LOCATION_FILE) -> Optional[Tuple[float, float, int, str, str, float]]:
+    """
+    Read the site and result of the last completed wind pipeline run.
+    The file is only re-read when its mtime changes; otherwise the record is served from memory.
+
+    Returns:
+    - (lat, lon, height, date_from, date_to, monthly_energy), or None if nothing has been recorded
+    """
+    # The one syscall on the cache-hit path; it is what lets other workers' writes show up
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        cached = _last_locations.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, _read_record(path))
+            _last_locations[path] = cached
+    except FileNotFoundError:
+        # Never written, or removed since the stat: treat as nothing recorded
+        _last_locations.pop(path, None)
+        return None
+    return cached[1]
+
+
+def save_last_location(lat: float, lon: float, height: int, date_from: date, date_to: date,
+                       monthly_energy: float, path: str = LAST_LOCATION_FILE) -> None:
+    """
+    Record the site and monthly energy of a completed wind pipeline run as a fixed-size binary record.
+    """
+    try:
+        record = _RECORD.pack(lat, lon, height, date_from.isoformat().encode('ascii'),
+                              date_to.isoformat().encode('ascii'), monthly_energy)
+    except struct.error:
+        # A height beyond 64 bits can't be recorded; the run's result is still returned, just not cached
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a file unique to this writer and swap it in, so readers never see a partial
+    # record and concurrent workers can't interleave one run's site with another's result
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(record)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    _last_locations[path] = (os.stat(path).st_mtime_ns,
+                             (lat, lon, height, date_from.isoformat(), date_to.isoformat(), monthly_energy))
+
+
+def load_cached_energy(lat: float, lon: float, height: int, date_from: date, date_to: date,
+                       path: str = LAST_LOCATION_FILE) -> Optional[float]:
+    """
+    Return the monthly energy of the last completed pipeline run if a wind request matches it.
+
+    The request matches when it asks for the same height and date window at a point
+    within LOCATION_THRESHOLD_KM of the recorded site.
+
+    Returns:
+    - monthly_energy (float), or None when the pipeline has to run
+    """
+    last = load_last_location(path)
+    if last is None:
+        return None
+
+    last_lat, last_lon, last_height, last_from, last_to, monthly_energy = last
+    if (last_height, last_from, last_to) != (height, date_from.isoformat(), date_to.isoformat()):
+        return None
+    if haversine(last_lat, last_lon, lat, lon, cos_lat1=_cos_lat(last_lat)) > LOCATION_THRESHOLD_KM:
+        return None
+    return monthly_energy
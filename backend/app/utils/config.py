@@ -0,0 +1,23 @@
+# app/utils/config.py - API keys read once per process from the environment and .env files
+
+from pathlib import Path
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class Settings(BaseSettings):
+    # Field names match the environment variables case-insensitively, e.g. NREL_API_KEY.
+    # Both the repo-root .env and backend/.env are read (the latter wins), as load_dotenv() found either.
+    model_config = SettingsConfigDict(env_file=(BACKEND_DIR.parent / ".env", BACKEND_DIR / ".env"), extra="ignore")
+
+    nrel_api_key: Optional[str] = None
+    electricitymap_api_key: Optional[str] = None
+    openai_api_key: Optional[str] = None
+    geocode_api_key: Optional[str] = None
+    cdsapi_key: Optional[str] = None
+
+
+settings = Settings()
@@ -0,0 +1,42 @@
+# app/utils/http.py - shared aiohttp session for outbound API calls
+
+import ssl
+from typing import Optional
+
+import aiohttp
+import certifi
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def open_http_session() -> aiohttp.ClientSession:
+    """
+    Create the process-wide session. Called once from the app lifespan.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            ssl=ssl.create_default_context(cafile=certifi.where()),
+            limit=100,
+            limit_per_host=20,
+            keepalive_timeout=60,
+            ttl_dns_cache=300
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+    return _session
+
+
+async def close_http_session() -> None:
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the shared session; keep-alive connections are reused across requests.
+    """
+    if _session is None or _session.closed:
+        raise RuntimeError("HTTP session is not open; it is created in the app lifespan")
+    return _session
@@ -0,0 +1,11 @@
+# app/utils/text.py - shared normalisation for text used as a cache key
+
+import unicodedata
+
+
+def normalise_key(text: str) -> str:
+    """
+    Fold text to a canonical cache key: NFKC-normalised, casefolded, with runs of whitespace collapsed.
+    "San  Francisco", "san francisco" and full-width variants all give the same key.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())